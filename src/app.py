@@ -1,72 +1,219 @@
 # app.py
 import os
 import asyncio
+import hashlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import lru_cache
 from datetime import date
+from email.utils import formatdate
 
-from fastapi import FastAPI, HTTPException, status, Response
+import aiohttp
+from fastapi import FastAPI, HTTPException, Request, status, Response
 from fastapi.responses import JSONResponse, HTMLResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from dotenv import load_dotenv
 from jinja2 import Environment, FileSystemLoader
-import json
+import orjson
 
 # Import your existing classes
 from src.github_stats import GitHubStatsAggregator
-from src.cache.cache_manager import CacheManager
-from src.config.config import get_cache_file
+from src.cache.cache_manager import CacheManager, write_file_atomic
+from src.cache.api_cache import prune_expired_api_cache
+from src.config.config import CACHE_DIR, get_cache_file
 from src.models.models import GitHubProfileStats
-from src.svg_util.svg_util import GitHubSVGUtil
+from src.svg_util.svg_util import GitHubSVGUtil, StatsPayload
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Load environment variables once when the app starts
+load_dotenv()
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse that serializes its content with orjson."""
+    def render(self, content) -> bytes:
+        return orjson.dumps(content)
+
+# Maximum number of GitHub API requests in flight at once across all users
+GITHUB_MAX_CONCURRENCY = 10
+# Worker threads backing asyncio.to_thread (cache file reads/writes)
+THREAD_POOL_SIZE = int(os.getenv("THREAD_POOL_SIZE", "64"))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Sets up shared resources when the application starts and releases them on shutdown."""
+    # Create the JSON and SVG cache directories once at startup instead of on every request
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    os.makedirs(SVG_CACHE_DIR, exist_ok=True)
+    logger.info(f"Ensured SVG cache directory exists: {SVG_CACHE_DIR}")
+
+    # Size the default executor for I/O-bound work so concurrent requests don't queue behind each other
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=THREAD_POOL_SIZE, thread_name_prefix="ghstats")
+    )
+
+    # Drop API response files that expired while the app was down
+    await asyncio.to_thread(prune_expired_api_cache)
+
+    # Read the token once and fail fast instead of discovering its absence on every request
+    github_token = os.getenv("GITHUB_TOKEN")
+    if not github_token:
+        logger.error("GitHub token not configured. Please set GITHUB_TOKEN environment variable.")
+        raise RuntimeError("GitHub token not configured. Please set GITHUB_TOKEN environment variable.")
+    app.state.github_token = github_token
+
+    # Shared HTTP session so every GitHub call reuses pooled keep-alive connections
+    headers = {
+        "Accept": "application/vnd.github.v3+json",
+        "Authorization": f"token {github_token}",
+    }
+    app.state.http = aiohttp.ClientSession(
+        headers=headers,
+        connector=aiohttp.TCPConnector(limit=50, ttl_dns_cache=300),
+    )
+    app.state.svg_template = SVG_TEMPLATE
+    # Bounds outbound GitHub calls so a burst of usernames cannot flood the event loop
+    app.state.github_sem = asyncio.Semaphore(GITHUB_MAX_CONCURRENCY)
+
+    yield
+
+    # Cached aggregators hold this lifespan's session and semaphore; don't hand them to a later one
+    _get_aggregator.cache_clear()
+    await app.state.http.close()
+
 app = FastAPI(
     title="GitHub Stats API",
     description="Fetches and caches comprehensive GitHub user statistics.",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 # Configure CORS middleware
-origins = [
-    "*"
-]
+# Comma-separated allowlist; without credentials the middleware can send static headers instead of echoing Origin
+origins = [origin.strip() for origin in os.getenv("CORS_ALLOW_ORIGINS", "*").split(",") if origin.strip()]
 
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
-    allow_credentials=True,
-    allow_methods=["*"],
+    allow_credentials=False,
+    allow_methods=["GET"],
     allow_headers=["*"],
 )
-
-# Load environment variables once when the app starts
-load_dotenv()
-env = Environment(loader=FileSystemLoader("templates"))
+# Compress the JSON and SVG payloads
+app.add_middleware(GZipMiddleware, minimum_size=500)
+# Templates never change at runtime, so skip Jinja's reload checks and compile once
+env = Environment(loader=FileSystemLoader("templates"), auto_reload=False, cache_size=-1)
+SVG_TEMPLATE = env.get_template("template.svg")
 
 # Define SVG cache directory
 SVG_CACHE_DIR = "cache/svg/"
+# Rendered SVGs are keyed on their template inputs; the template's mtime is folded in so edits invalidate them
+SVG_TEMPLATE_VERSION = str(os.stat(SVG_TEMPLATE.filename).st_mtime_ns).encode()
+# In-memory LRU of rendered SVG bytes by content key (~50KB each, so roughly 50MB at the cap)
+SVG_MEM_MAX_ENTRIES = 1024
+_SVG_MEM: OrderedDict[str, bytes] = OrderedDict()
+
+@lru_cache(maxsize=512)
+def _get_aggregator(username: str, token: str) -> GitHubStatsAggregator:
+    """
+    Returns a reusable aggregator (and its services) for the given username,
+    bound to the shared HTTP session so connections are kept alive across users.
+    """
+    return GitHubStatsAggregator(username, token, app.state.http, app.state.github_sem)
+
+@lru_cache(maxsize=512)
+def _get_cache_manager(cache_file: str) -> CacheManager:
+    """Returns a reusable CacheManager for the given cache file path."""
+    return CacheManager(cache_file)
+
+def _namedtuple_as_dict(obj):
+    """orjson default hook: serializes namedtuples (e.g. LanguageBar) as objects."""
+    if hasattr(obj, "_asdict"):
+        return obj._asdict()
+    raise TypeError
+
+def _svg_cache_key(template_data: StatsPayload) -> str:
+    """Returns a content hash of the SVG template inputs."""
+    payload = orjson.dumps(template_data, default=_namedtuple_as_dict, option=orjson.OPT_SORT_KEYS) + SVG_TEMPLATE_VERSION
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+def _remember_svg(svg_key: str, svg_bytes: bytes):
+    """Stores rendered SVG bytes in the in-memory LRU, evicting the oldest entry when full."""
+    _SVG_MEM[svg_key] = svg_bytes
+    _SVG_MEM.move_to_end(svg_key)
+    if len(_SVG_MEM) > SVG_MEM_MAX_ENTRIES:
+        _SVG_MEM.popitem(last=False)
+
+def _read_svg_file(svg_file_path: str) -> bytes | None:
+    """Reads a cached SVG (blocking; run in a worker thread). Returns None if it does not exist."""
+    try:
+        with open(svg_file_path, "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
 
-@app.on_event("startup")
-async def startup_event():
-    """Event handler that runs when the application starts."""
-    # Ensure SVG cache directory exists on startup
-    os.makedirs(SVG_CACHE_DIR, exist_ok=True)
-    logger.info(f"Ensured SVG cache directory exists: {SVG_CACHE_DIR}")
+def _update_svg_link(username: str, svg_file_name: str):
+    """
+    Points cache_{username}.svg at the latest content-addressed SVG for the user
+    and removes the SVG it previously pointed to.
+    """
+    link_path = os.path.join(SVG_CACHE_DIR, f"cache_{username}.svg")
+    try:
+        previous = os.readlink(link_path)
+    except OSError:
+        previous = None
+    if previous == svg_file_name:
+        return
+    tmp_link = f"{link_path}.tmp"
+    if os.path.lexists(tmp_link):
+        os.remove(tmp_link)
+    os.symlink(svg_file_name, tmp_link)
+    os.replace(tmp_link, link_path)
+    if previous:
+        try:
+            os.remove(os.path.join(SVG_CACHE_DIR, previous))
+        except FileNotFoundError:
+            pass
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """Checks the request's If-None-Match header against an ETag (weak comparison)."""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    target = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == target for tag in if_none_match.split(","))
+
+def _cache_headers(etag: str, cache_file: str) -> dict[str, str]:
+    """Builds the ETag, Cache-Control and Last-Modified headers for a stats response."""
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=3600"}
+    try:
+        headers["Last-Modified"] = formatdate(os.stat(cache_file).st_mtime, usegmt=True)
+    except OSError:
+        pass
+    return headers
 
 # New Helper Function for fetching and caching stats
-async def _fetch_and_cache_github_stats(username: str, token: str, cache_manager: CacheManager) -> GitHubProfileStats:
+async def _fetch_and_cache_github_stats(username: str, token: str, cache_manager: CacheManager) -> tuple[GitHubProfileStats, dict]:
     """
     Helper function to fetch fresh GitHub stats and save them to cache.
+    Returns the stats model together with its dictionary form, serialized once for reuse by the caller.
     Raises HTTPException if fetching fails.
     """
     logger.info(f" Fetching fresh GitHub stats for {username}...")
     try:
-        aggregator = GitHubStatsAggregator(username, token)
-        stats = await asyncio.to_thread(aggregator.get_all_stats)
+        aggregator = _get_aggregator(username, token)
+        stats = await aggregator.get_all_stats()
         # Use .dict() for Pydantic v1 compatibility
-        await asyncio.to_thread(cache_manager.save_stats_to_cache, stats.dict())
+        stats_dict = stats.dict()
+        await asyncio.to_thread(cache_manager.save_stats_to_cache, stats_dict)
         logger.info(f" Successfully fetched and cached stats for {username}.")
-        return stats
+        return stats, stats_dict
     except Exception as e:
         logger.error(f" Failed to fetch stats for {username}: {e}", exc_info=True)
         raise HTTPException(
@@ -74,122 +221,98 @@ async def _fetch_and_cache_github_stats(username: str, token: str, cache_manager
             detail=f"Failed to fetch GitHub stats for {username}: {e}"
         )
 
-@app.get("/stats/{username}", response_class=JSONResponse)
-async def get_github_stats(username: str):
+@app.get("/stats/{username}", response_class=ORJSONResponse)
+async def get_github_stats(username: str, request: Request):
     """
     Fetches comprehensive GitHub statistics for a given username.
-    Stats are cached to reduce API calls.
+    Stats are cached to reduce API calls, and clients revalidate them with ETags.
     """
-    github_token = os.getenv("GITHUB_TOKEN")
-    if not github_token:
-        logger.error("GitHub token not configured. Please set GITHUB_TOKEN environment variable.")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="GitHub token not configured. Please set GITHUB_TOKEN environment variable."
-        )
-
+    github_token = app.state.github_token
     CACHE_FILE = get_cache_file(username)
-    cache_manager = CacheManager(CACHE_FILE)
+    cache_manager = _get_cache_manager(CACHE_FILE)
 
-    stats = await asyncio.to_thread(cache_manager.load_cached_stats)
+    stats_dict = await asyncio.to_thread(cache_manager.load_cached_stats)
 
-    if stats:
+    if stats_dict:
+        # The cache is only ever written from validated models, so serve it as-is
         logger.info(f"Using cached stats for {username}.")
-        # Validate cached stats against the Pydantic model schema
-        try:
-            # Ensure the loaded stats are converted back into a Pydantic model
-            stats = GitHubProfileStats(**stats)
-        except Exception as e:
-            logger.warning(f" Cached stats for {username} do not match schema: {e}. Refetching fresh stats.", exc_info=True)
-            stats = None # Force refetch
     else:
         # JSON cache is expired or not present, force refetch
         logger.info(f" JSON cache expired or not present for {username}. Forcing fresh fetch.")
-        stats = None
-
-    # If stats are not available (JSON cache expired/missing, or schema mismatch), fetch fresh
-    if stats is None:
-        stats = await _fetch_and_cache_github_stats(username, github_token, cache_manager)
+        _, stats_dict = await _fetch_and_cache_github_stats(username, github_token, cache_manager)
 
-    # Use .dict() for Pydantic v1 compatibility
-    return JSONResponse(content=stats.dict())
+    body = orjson.dumps(stats_dict)
+    etag = f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    headers = _cache_headers(etag, CACHE_FILE)
+    if _etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @app.get("/stats/{username}/svg", response_class=Response)
-async def get_github_stats_svg(username: str):
+async def get_github_stats_svg(username: str, request: Request):
     """
     Generates an SVG image displaying GitHub statistics for a given username.
-    The SVG is cached to reduce regeneration time.
+    The SVG is cached to reduce regeneration time, and clients revalidate it with ETags.
     """
-    github_token = os.getenv("GITHUB_TOKEN")
-    if not github_token:
-        logger.error("GitHub token not configured. Please set GITHUB_TOKEN environment variable.")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="GitHub token not configured. Please set GITHUB_TOKEN environment variable."
-        )
-
+    github_token = app.state.github_token
     CACHE_FILE = get_cache_file(username)
-    SVG_FILE_PATH = os.path.join(SVG_CACHE_DIR, f"cache_{username}.svg")
-    cache_manager = CacheManager(CACHE_FILE)
-
-    stats = None # Initialize stats to None
+    cache_manager = _get_cache_manager(CACHE_FILE)
 
     # Step 1: Try to load from JSON cache first
-    cached_json_stats = await asyncio.to_thread(cache_manager.load_cached_stats)
+    stats_dict = await asyncio.to_thread(cache_manager.load_cached_stats)
 
-    if cached_json_stats:
-        try:
-            # Validate JSON cache schema
-            stats = GitHubProfileStats(**cached_json_stats) # Convert to Pydantic model for internal consistency
-            logger.info(f"Using valid JSON cache for {username}.")
-
-            # Step 2: If JSON cache is valid, check if SVG cache exists and serve it
-            if os.path.exists(SVG_FILE_PATH):
-                with open(SVG_FILE_PATH, "r") as f:
-                    svg_content = f.read()
-                logger.info(f"Serving cached SVG for {username}.")
-                return Response(content=svg_content, media_type="image/svg+xml")
-            else:
-                logger.info(f"SVG cache not found for {username}, but valid JSON cache exists. Generating new SVG from cache.")
-                # `stats` is already populated from `cached_json_stats`, so we proceed to generation
-        except Exception as e:
-            logger.warning(f" Cached JSON for {username} do not match schema: {e}. Forcing fresh fetch.", exc_info=True)
-            stats = None # Force refetch as JSON cache is invalid/corrupt
+    if stats_dict:
+        # The cache is only ever written from validated models, so render from it as-is
+        logger.info(f"Using valid JSON cache for {username}.")
     else:
         logger.info(f"JSON cache expired or not present for {username}. Forcing fresh fetch.")
-        stats = None # Force refetch as JSON cache is not available or expired
-
-    # Step 3: If `stats` is still None (i.e., no valid JSON cache was found/used), fetch fresh data
-    if stats is None:
-        stats = await _fetch_and_cache_github_stats(username, github_token, cache_manager)
+        # Step 2: No valid JSON cache was found, fetch fresh data
+        _, stats_dict = await _fetch_and_cache_github_stats(username, github_token, cache_manager)
 
-    # Step 4: Now that we have valid `stats` (either from fresh fetch or valid JSON cache), generate and serve SVG
     try:
-        # GitHubSVGUtil.load_stats_from_json expects a path to a JSON file.
-        # Since `_fetch_and_cache_github_stats` and `cache_manager.load_cached_stats`
-        # both ensure the CACHE_FILE is up-to-date, we can reliably use it here.
-        template_data = await asyncio.to_thread(GitHubSVGUtil.load_stats_from_json, CACHE_FILE)
-        template = env.get_template("template.svg")
-        svg_content = template.render(**template_data)
-
-        # Save the generated SVG to file
-        await asyncio.to_thread(lambda: os.makedirs(SVG_CACHE_DIR, exist_ok=True))
-        await asyncio.to_thread(lambda: open(SVG_FILE_PATH, "w").write(svg_content))
-        logger.info(f"Saved new SVG to cache: {SVG_FILE_PATH}")
-
-        return Response(content=svg_content, media_type="image/svg+xml")
+        # Step 3: Key the SVG on its template inputs, so unchanged stats reuse the previous render
+        template_data = GitHubSVGUtil.build_template_data(stats_dict)
+        svg_key = _svg_cache_key(template_data)
+        svg_file_name = f"{username}_{svg_key}.svg"
+        svg_file_path = os.path.join(SVG_CACHE_DIR, svg_file_name)
+
+        # The content key already identifies the rendered output, so it doubles as the ETag
+        headers = _cache_headers(f'"{svg_key}"', CACHE_FILE)
+        if _etag_matches(request, headers["ETag"]):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        svg_bytes = _SVG_MEM.get(svg_key)
+        if svg_bytes is not None:
+            _SVG_MEM.move_to_end(svg_key)
+            logger.info(f"Serving in-memory SVG for {username}.")
+            return Response(content=svg_bytes, media_type="image/svg+xml", headers=headers)
+
+        # Read on a worker thread; None means a concurrent _update_svg_link removed it, so render it again
+        svg_bytes = await asyncio.to_thread(_read_svg_file, svg_file_path)
+        if svg_bytes is not None:
+            _remember_svg(svg_key, svg_bytes)
+            logger.info(f"Serving cached SVG for {username}.")
+            return Response(content=svg_bytes, media_type="image/svg+xml", headers=headers)
+
+        # Step 4: Inputs changed (or were never rendered), generate and cache a new SVG
+        svg_content = app.state.svg_template.render(**template_data)
+
+        # Save the generated SVG to file; a single small write is cheaper inline than a thread hop
+        svg_bytes = svg_content.encode()
+        write_file_atomic(svg_file_path, svg_bytes)
+        _update_svg_link(username, svg_file_name)
+        _remember_svg(svg_key, svg_bytes)
+        logger.info(f"Saved new SVG to cache: {svg_file_path}")
+
+        return Response(content=svg_bytes, media_type="image/svg+xml", headers=headers)
     except Exception as e:
         logger.error(f" Error generating or saving SVG for {username}: {e}", exc_info=True)
         return HTMLResponse(f"<h3>Error generating or saving SVG: {e}</h3>", status_code=500)
 
 
-@app.get("/")
-async def read_root():
-    """
-    Root endpoint for the API.
-    """
-    return HTMLResponse("""
+# Root page is static, so it is built once as bytes and served without re-encoding
+_ROOT_HTML = b"""
         <!DOCTYPE html>
         <html lang="en">
         <head>
@@ -283,4 +406,11 @@ async def read_root():
             </div>
         </body>
         </html>
-    """)
\ No newline at end of file
+    """
+
+@app.get("/")
+async def read_root():
+    """
+    Root endpoint for the API.
+    """
+    return HTMLResponse(content=_ROOT_HTML)
@@ -0,0 +1,138 @@
+# src/cache/api_cache.py
+import asyncio
+import functools
+import hashlib
+import os
+import time
+from collections import OrderedDict
+import orjson
+from typing import Dict, Any, Tuple
+
+from src.cache.cache_manager import write_file_atomic
+from src.config.config import API_CACHE_DIR, API_CACHE_DEFAULT_TTL_SECONDS, API_CACHE_REPO_TTL_SECONDS
+from src.utils.logger import get_logger # Import the new logger utility
+
+logger = get_logger(__name__) # Initialize logger for this module
+
+# Upper bound on responses held in memory; least recently used entries are evicted first
+API_CACHE_MEM_MAX_ENTRIES = 1024
+# Entry files are stamped with their write time; none can outlive the longest TTL
+API_CACHE_MAX_TTL_SECONDS = API_CACHE_REPO_TTL_SECONDS
+# How often storing a response also sweeps expired entry files from disk
+API_CACHE_PRUNE_INTERVAL_SECONDS = 3600
+
+# In-memory LRU layer in front of the per-key files: key -> (expires_at, data)
+_API_MEM: OrderedDict[str, Tuple[float, Any]] = OrderedDict()
+_last_prune = 0.0
+
+def _cache_key(username: str, name: str, args: tuple, kwargs: Dict[str, Any]) -> str:
+    """
+    Hashes the request identity (user, client method, url/query and sorted variables) into a file-safe key.
+    """
+    raw = orjson.dumps([username, name, args, kwargs], option=orjson.OPT_SORT_KEYS)
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+def _remember(key: str, expires_at: float, data: Any):
+    """Adds an entry to the in-memory LRU, dropping expired entries and then the least recently used ones."""
+    now = time.time()
+    for stale_key in [k for k, (exp, _) in _API_MEM.items() if exp <= now]:
+        del _API_MEM[stale_key]
+    _API_MEM[key] = (expires_at, data)
+    _API_MEM.move_to_end(key)
+    while len(_API_MEM) > API_CACHE_MEM_MAX_ENTRIES:
+        _API_MEM.popitem(last=False)
+
+def _read_entry(key: str) -> Dict[str, Any] | None:
+    """Reads an entry file from disk (blocking; run in a worker thread)."""
+    path = os.path.join(API_CACHE_DIR, f"{key}.json")
+    try:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable API cache entry {path}: {e}")
+        return None
+
+def _write_entry(key: str, expires_at: float, data: Any):
+    """Writes an entry file to disk (blocking; run in a worker thread)."""
+    try:
+        os.makedirs(API_CACHE_DIR, exist_ok=True)
+        write_file_atomic(os.path.join(API_CACHE_DIR, f"{key}.json"), orjson.dumps({"expires_at": expires_at, "data": data}))
+    except OSError as e:
+        logger.error(f"Error saving API cache entry {key}: {e}", exc_info=True)
+
+def prune_expired_api_cache():
+    """
+    Deletes entry files older than the longest TTL, which are necessarily expired.
+    Blocking; called from a worker thread at startup and periodically while responses are stored.
+    """
+    cutoff = time.time() - API_CACHE_MAX_TTL_SECONDS
+    removed = 0
+    try:
+        entries = list(os.scandir(API_CACHE_DIR))
+    except FileNotFoundError:
+        return
+    for entry in entries:
+        try:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+                removed += 1
+        except FileNotFoundError:
+            continue # Removed concurrently
+        except OSError as e:
+            logger.warning(f"Could not prune API cache entry {entry.path}: {e}")
+    if removed:
+        logger.info(f"Pruned {removed} expired API cache entries from {API_CACHE_DIR}")
+
+async def _load(key: str) -> Any | None:
+    """Returns the unexpired cached response for key from memory or disk, or None."""
+    now = time.time()
+    cached = _API_MEM.get(key)
+    if cached:
+        if cached[0] > now:
+            _API_MEM.move_to_end(key)
+            return cached[1]
+        del _API_MEM[key]
+
+    entry = await asyncio.to_thread(_read_entry, key)
+    if not entry or entry.get("expires_at", 0) <= now:
+        return None
+    _remember(key, entry["expires_at"], entry["data"])
+    return entry["data"]
+
+async def _store(key: str, data: Any, ttl: int):
+    """Stores a response in memory and on disk with an absolute expiry."""
+    global _last_prune
+    expires_at = time.time() + ttl
+    _remember(key, expires_at, data)
+    await asyncio.to_thread(_write_entry, key, expires_at, data)
+    if time.time() - _last_prune > API_CACHE_PRUNE_INTERVAL_SECONDS:
+        _last_prune = time.time()
+        await asyncio.to_thread(prune_expired_api_cache)
+
+def cached_api_response(default_ttl: int = API_CACHE_DEFAULT_TTL_SECONDS):
+    """
+    Decorator for GitHubAPIClient request methods that serves repeat requests from a TTL cache.
+
+    Callers may pass `ttl=<seconds>` to override the TTL for a given operation; `ttl=0` bypasses the cache.
+    Error responses (dicts carrying an 'errors' key) are never cached.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(self, *args, ttl: int | None = None, **kwargs):
+            ttl = default_ttl if ttl is None else ttl
+            if ttl <= 0:
+                return await func(self, *args, **kwargs)
+
+            key = _cache_key(self.username, func.__name__, args, kwargs)
+            cached = await _load(key)
+            if cached is not None:
+                return cached
+
+            data = await func(self, *args, **kwargs)
+            if not (isinstance(data, dict) and "errors" in data):
+                await _store(key, data, ttl)
+            return data
+        return wrapper
+    return decorator
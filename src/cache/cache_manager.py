@@ -1,8 +1,10 @@
 # src/cache/cache_manager.py
-import json
 import os
-from datetime import datetime, timedelta
-from typing import Dict, Any
+import threading
+import time
+from collections import OrderedDict
+import orjson
+from typing import Dict, Any, Tuple
 
 from src.config.config import CACHE_DURATION_HOURS
 from src.models.models import GitHubProfileStats # Import the dataclass
@@ -10,6 +12,46 @@ from src.utils.logger import get_logger # Import the new logger utility
 
 logger = get_logger(__name__) # Initialize logger for this module
 
+CACHE_DURATION_SECONDS = CACHE_DURATION_HOURS * 3600
+
+# In-memory LRU of parsed stats per cache file, stamped with the file's mtime so a rewrite invalidates the entry
+STATS_MEM_MAX_ENTRIES = 1024
+_STATS_MEM: OrderedDict[str, Tuple[int, Dict[str, Any]]] = OrderedDict()
+# Loads and saves run on worker threads, so the LRU is only touched under this lock
+_STATS_MEM_LOCK = threading.Lock()
+
+def _recall_stats(cache_file: str, mtime_ns: int) -> Dict[str, Any] | None:
+    """Returns the parsed stats remembered for cache_file if they match its mtime, else None."""
+    with _STATS_MEM_LOCK:
+        cached = _STATS_MEM.get(cache_file)
+        if cached is None or cached[0] != mtime_ns:
+            return None
+        _STATS_MEM.move_to_end(cache_file)
+        return cached[1]
+
+def _remember_stats(cache_file: str, mtime_ns: int, stats: Dict[str, Any]):
+    """Stores parsed stats in the in-memory LRU, evicting the oldest entry when full."""
+    with _STATS_MEM_LOCK:
+        _STATS_MEM[cache_file] = (mtime_ns, stats)
+        _STATS_MEM.move_to_end(cache_file)
+        if len(_STATS_MEM) > STATS_MEM_MAX_ENTRIES:
+            _STATS_MEM.popitem(last=False)
+
+def write_file_atomic(path: str, payload: bytes):
+    """
+    Writes payload to path in a single write and atomically swaps it into place,
+    so concurrent readers never observe a partially written file.
+    """
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
 class CacheManager:
     """
     Manages caching of GitHub profile statistics to a JSON file.
@@ -24,17 +66,24 @@ class CacheManager:
         Returns:
             dict | None: The cached statistics as a dictionary if valid, otherwise None.
         """
-        if not os.path.exists(self.cache_file):
+        # Freshness is decided from the file's mtime so stale caches are rejected without parsing them
+        try:
+            st = os.stat(self.cache_file)
+        except FileNotFoundError:
             logger.info(f"Cache file not found at {self.cache_file}.")
             return None
+        if st.st_mtime + CACHE_DURATION_SECONDS < time.time():
+            logger.info(f"Cache file at {self.cache_file} has expired.")
+            return None
+        cached = _recall_stats(self.cache_file, st.st_mtime_ns)
+        if cached is not None:
+            return cached
         try:
-            with open(self.cache_file, "r") as f:
-                data = json.load(f)
-                last_updated = datetime.fromisoformat(data.get("last_updated"))
-                if datetime.now() - last_updated < timedelta(hours=CACHE_DURATION_HOURS):
-                    return data.get("stats")
-                else:
-                    logger.info(f"Cache file at {self.cache_file} has expired.")
+            with open(self.cache_file, "rb") as f:
+                data = orjson.loads(f.read())
+            stats = data["stats"]
+            _remember_stats(self.cache_file, st.st_mtime_ns, stats)
+            return stats
         except Exception as e:
             logger.error(f" Failed to load cache from {self.cache_file}: {e}", exc_info=True) # Use logger.error
         return None
@@ -48,11 +97,12 @@ class CacheManager:
         """
         os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
         try:
-            with open(self.cache_file, "w") as f:
-                json.dump({
-                    "last_updated": datetime.now().isoformat(),
-                    "stats": stats_dict
-                }, f, indent=2, default=str) # default=str to handle datetime objects if any
+            payload = orjson.dumps({
+                "expires_at": int(time.time()) + CACHE_DURATION_SECONDS,
+                "stats": stats_dict
+            })
+            write_file_atomic(self.cache_file, payload)
+            _remember_stats(self.cache_file, os.stat(self.cache_file).st_mtime_ns, stats_dict)
             logger.info(f"Stats successfully saved to cache: {self.cache_file}")
         except IOError as e:
             logger.error(f"Error saving stats to cache file {self.cache_file}: {e}", exc_info=True)
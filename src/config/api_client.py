@@ -1,73 +1,205 @@
 # src/config/api_client.py
-import requests
+import asyncio
+import contextlib
+import time
+from email.utils import parsedate_to_datetime
+import aiohttp
+import orjson
 from typing import Dict, Any, List
+from src.cache.api_cache import cached_api_response
+from src.config.config import API_CACHE_REPO_TTL_SECONDS
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+RETRY_STATUS_CODES = frozenset({429, 502, 503, 504})
+MAX_RETRIES = 3
+RETRY_BACKOFF_SECONDS = 0.3
+# Longest server-requested wait (Retry-After / x-ratelimit-reset) worth sleeping through before retrying
+RETRY_MAX_DELAY_SECONDS = 30
+
+def _rate_limit_delay(headers) -> float | None:
+    """
+    Seconds GitHub asks us to wait, from Retry-After (seconds or HTTP date) or, once the
+    rate limit is exhausted, x-ratelimit-reset (epoch seconds). None if neither is given.
+    """
+    retry_after = headers.get("Retry-After")
+    if retry_after:
+        try:
+            return max(float(retry_after), 0.0)
+        except ValueError:
+            try:
+                return max(parsedate_to_datetime(retry_after).timestamp() - time.time(), 0.0)
+            except (TypeError, ValueError):
+                return None
+    reset = headers.get("x-ratelimit-reset")
+    if reset and headers.get("x-ratelimit-remaining") == "0":
+        try:
+            return max(float(reset) - time.time(), 0.0)
+        except ValueError:
+            return None
+    return None
+
+REPOS_WITH_LANGUAGES_QUERY = """
+query($username: String!, $cursor: String) {
+  user(login: $username) {
+    repositories(first: 100, after: $cursor, ownerAffiliations: OWNER, privacy: PUBLIC, isFork: false) {
+      pageInfo {
+        hasNextPage
+        endCursor
+      }
+      nodes {
+        name
+        isFork
+        owner {
+          login
+        }
+        languages(first: 20, orderBy: {field: SIZE, direction: DESC}) {
+          edges {
+            size
+            node {
+              name
+            }
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+USER_CREATED_AT_QUERY = """
+query($username: String!) {
+  user(login: $username) {
+    createdAt
+  }
+}
+"""
+
 class GitHubAPIClient:
     """
-    A low-level client for interacting with the GitHub API (REST and GraphQL).
-    Handles authentication and basic error checking.
+    A low-level async client for interacting with the GitHub API (REST and GraphQL).
+    Handles authentication and basic error checking. Successful responses are cached
+    on disk with a per-operation TTL (see src/cache/api_cache.py).
+    Requests are issued on a shared aiohttp.ClientSession owned by the application,
+    optionally bounded by a shared semaphore.
     """
-    def __init__(self, username: str, token: str | None = None):
+    def __init__(
+        self,
+        username: str,
+        token: str | None = None,
+        session: aiohttp.ClientSession | None = None,
+        semaphore: asyncio.Semaphore | None = None,
+    ):
         self.username = username
+        self.session = session
+        self.semaphore = semaphore or contextlib.nullcontext()
         self.headers = {'Accept': 'application/vnd.github.v3+json'}
+        self._created_at: str | None = None # Account creation time never changes, so it is kept once fetched
         if token:
             self.headers['Authorization'] = f'token {token}'
         else:
             logger.warning("No GitHub token provided. Rate limits might be hit sooner, and some GraphQL queries may not work.")
 
-    def _make_request(self, method: str, url: str, params: Dict[str, Any] | None = None) -> Dict[str, Any] | List[Dict[str, Any]]:
+    @cached_api_response()
+    async def _make_request(self, method: str, url: str, params: Dict[str, Any] | None = None) -> Dict[str, Any] | List[Dict[str, Any]]:
         """
         Helper method to make a generic REST API request.
         """
-        try:
-            response = requests.request(method, url, headers=self.headers, params=params)
-            response.raise_for_status()  # Raise an exception for HTTP errors (4xx or 5xx)
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            logger.error(f"REST API request failed for {url}: {e}")
-            if hasattr(e, 'response') and e.response is not None:
-                logger.error(f"    Response status: {e.response.status_code}")
-                logger.error(f"    Response content: {e.response.text}")
-            # Corrected syntax here: removed escaped quotes from within the dict literal
-            return {"errors": [{"message": str(e)}]}
+        return await self._request_json(method, url, f"REST API request failed for {url}", params=params)
 
-    def get_user_repos(self, page: int = 1, per_page: int = 100) -> List[Dict[str, Any]]:
+    async def get_user_repos(self, page: int = 1, per_page: int = 100) -> List[Dict[str, Any]]:
         """Fetches a list of public repositories for the user."""
         url = f"https://api.github.com/users/{self.username}/repos"
-        result = self._make_request("GET", url, params={'page': page, 'per_page': per_page})
+        result = await self._make_request("GET", url, params={'page': page, 'per_page': per_page}, ttl=API_CACHE_REPO_TTL_SECONDS)
         if isinstance(result, list):
             return result
         logger.error(f"get_user_repos received non-list result or error for {self.username}: {result}")
         return []
 
-    def get_repo_languages(self, owner: str, repo_name: str) -> Dict[str, int]:
+    async def get_repo_languages(self, owner: str, repo_name: str) -> Dict[str, int]:
         """
         Fetches language breakdown (bytes) for a specific repository.
         """
         url = f"https://api.github.com/repos/{owner}/{repo_name}/languages"
-        result = self._make_request("GET", url)
-        if isinstance(result, dict) and "error" not in result: # Check for 'error' key to ensure it's not an error dict
+        result = await self._make_request("GET", url, ttl=API_CACHE_REPO_TTL_SECONDS)
+        if isinstance(result, dict) and "errors" not in result: # Check for 'errors' key to ensure it's not an error dict
             return result
         logger.error(f"get_repo_languages failed for {owner}/{repo_name}: {result}")
         return {}
 
-    def execute_graphql_query(self, query: str, variables: Dict[str, Any] | None = None) -> Dict[str, Any]:
+    async def get_user_repos_with_languages_graphql(self, cursor: str | None = None) -> Dict[str, Any]:
+        """
+        Fetches one page (up to 100) of the user's public repositories with their language sizes (bytes).
+        Returns the `repositories` connection ({'pageInfo': ..., 'nodes': [...]}), or an empty dict on error.
+        """
+        data = await self.execute_graphql_query(REPOS_WITH_LANGUAGES_QUERY, {"username": self.username, "cursor": cursor}, ttl=API_CACHE_REPO_TTL_SECONDS)
+        if 'errors' in data or 'data' not in data or data['data'] is None:
+            logger.error(f"get_user_repos_with_languages_graphql failed for {self.username}: {data.get('errors', 'Unknown GraphQL error')}")
+            return {}
+        return (data['data'].get('user') or {}).get('repositories') or {}
+
+    async def get_user_created_at(self) -> str | None:
+        """
+        Fetches the account creation timestamp (ISO 8601, e.g. '2019-08-26T10:00:00Z'), or None on error.
+        """
+        if self._created_at is None:
+            data = await self.execute_graphql_query(USER_CREATED_AT_QUERY, {"username": self.username}, ttl=API_CACHE_REPO_TTL_SECONDS)
+            if 'errors' in data or 'data' not in data or data['data'] is None:
+                logger.error(f"get_user_created_at failed for {self.username}: {data.get('errors', 'Unknown GraphQL error')}")
+                return None
+            self._created_at = (data['data'].get('user') or {}).get('createdAt')
+        return self._created_at
+
+    @cached_api_response()
+    async def execute_graphql_query(self, query: str, variables: Dict[str, Any] | None = None) -> Dict[str, Any]:
         """
         Executes a GraphQL query against the GitHub API.
         """
         url = "https://api.github.com/graphql"
         payload = {'query': query, 'variables': variables}
-        try:
-            response = requests.post(url, headers=self.headers, json=payload)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            logger.error(f"GraphQL query failed: {e}")
-            if hasattr(e, 'response') and e.response is not None:
-                logger.error(f"    Response status: {e.response.status_code}")
-                logger.error(f"    Response content: {e.response.text}")
-            # Corrected syntax here: removed escaped quotes from within the dict literal
-            return {"errors": [{"message": str(e)}]}
\ No newline at end of file
+        return await self._request_json("POST", url, "GraphQL query failed", json=payload)
+
+    async def _request_json(self, method: str, url: str, failure_message: str, **kwargs) -> Any:
+        """
+        Sends a request on the shared session and decodes the JSON body.
+        Rate-limit and gateway errors (429/502/503/504) and connection errors are retried with
+        exponential backoff. When GitHub says how long to wait (Retry-After, or x-ratelimit-reset once
+        the limit is exhausted, also on 403), that delay is used instead, unless it exceeds
+        RETRY_MAX_DELAY_SECONDS, in which case the request fails right away.
+        Other failures are returned as {'errors': [...]}.
+        """
+        for attempt in range(MAX_RETRIES + 1):
+            retryable = attempt < MAX_RETRIES
+            delay = RETRY_BACKOFF_SECONDS * 2 ** attempt
+            try:
+                async with self.semaphore, self.session.request(method, url, headers=self.headers, **kwargs) as response:
+                    status = response.status
+                    requested_delay = _rate_limit_delay(response.headers) if status in (403, 429) else None
+                    # 403 is only a rate limit (primary or secondary) when GitHub says how long to wait
+                    should_retry = retryable and (status in RETRY_STATUS_CODES or requested_delay is not None)
+                    if should_retry and requested_delay is not None:
+                        if requested_delay > RETRY_MAX_DELAY_SECONDS:
+                            # Retrying before the limit resets would only spend another request
+                            should_retry = False
+                        else:
+                            delay = requested_delay
+                    if should_retry:
+                        logger.warning(f"{failure_message}: {status} {response.reason}, retrying in {delay:.1f}s (attempt {attempt + 1}/{MAX_RETRIES})")
+                    elif status >= 400:
+                        logger.error(f"{failure_message}: {status} {response.reason}")
+                        logger.error(f"    Response content: {await response.text()}")
+                        return {"errors": [{"message": f"{status} {response.reason}"}]}
+                    else:
+                        # orjson parses the raw bytes directly, skipping aiohttp's decode-to-str + json.loads
+                        return orjson.loads(await response.read())
+            except orjson.JSONDecodeError as e:
+                logger.error(f"{failure_message}: invalid JSON in response: {e}")
+                return {"errors": [{"message": f"Invalid JSON response: {e}"}]}
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if not retryable:
+                    logger.error(f"{failure_message}: {e}")
+                    return {"errors": [{"message": str(e)}]}
+                logger.warning(f"{failure_message}: {e}, retrying (attempt {attempt + 1}/{MAX_RETRIES})")
+            # Back off outside the semaphore so waiting retries don't hold a concurrency slot
+            await asyncio.sleep(delay)
@@ -4,6 +4,12 @@ import os
 # --- Configuration ---
 
 CACHE_DURATION_HOURS = 12
+CACHE_DIR = "cache"
+
+# Raw GitHub API responses, cached per request (see src/cache/api_cache.py)
+API_CACHE_DIR = os.path.join(CACHE_DIR, "api")
+API_CACHE_DEFAULT_TTL_SECONDS = 3600 # Contribution calendar, counts and searches
+API_CACHE_REPO_TTL_SECONDS = 24 * 3600 # Repository lists and language sizes change slowly
 
 def get_cache_file(username: str) -> str:
     """
@@ -15,6 +21,5 @@ def get_cache_file(username: str) -> str:
     Returns:
         str: The full path to the cache file.
     """
-    cache_dir = "cache"
-    os.makedirs(cache_dir, exist_ok=True)
-    return os.path.join(cache_dir, f"{username}_github_stats.json")
\ No newline at end of file
+    # The cache directory is created once at application startup
+    return os.path.join(CACHE_DIR, f"{username}_github_stats.json")
\ No newline at end of file
@@ -1,53 +1,119 @@
 # src/github_stats.py
 
 # Removed: import logging
+import asyncio
 from typing import Dict, Any
 from datetime import date # Import date for formatting
 
-from src.models.models import GitHubProfileStats, StreakData, LanguageLOCData
+import aiohttp
+
+from src.models.models import GitHubProfileStats, LanguageLOCData
 from src.config.api_client import GitHubAPIClient
 from src.services.repo_service import GitHubRepoService
 from src.services.contribution_service import GitHubContributionService
 from src.services.language_service import GitHubLanguageService
+from src.services.aggregate_service import GitHubAggregateService
+from src.utils.memoize import reset_memo
 from src.utils.logger import get_logger # Import the new logger utility
 
 logger = get_logger(__name__) # Initialize logger for this module
 
+_MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+def _fmt(d: date) -> str:
+    """Formats a date as 'Mon DD' (same as strftime("%b %d") in the C locale) without going through strftime."""
+    return f"{_MONTHS[d.month - 1]} {d.day:02d}"
+
 class GitHubStatsAggregator:
     """
     Aggregates statistics from various GitHub services to compile a complete
     GitHubProfileStats object.
     """
-    def __init__(self, username: str, token: str | None = None):
+    def __init__(
+        self,
+        username: str,
+        token: str | None = None,
+        session: aiohttp.ClientSession | None = None,
+        semaphore: asyncio.Semaphore | None = None,
+    ):
         self.username = username
-        self.api_client = GitHubAPIClient(username, token)
+        self.api_client = GitHubAPIClient(username, token, session, semaphore)
         self.repo_service = GitHubRepoService(self.api_client)
         self.contribution_service = GitHubContributionService(self.api_client)
         self.language_service = GitHubLanguageService(self.api_client)
+        self.aggregate_service = GitHubAggregateService(self.api_client)
+        self._all_stats_task: asyncio.Future | None = None # In-flight get_all_stats shared by concurrent callers
+
+    def get_all_stats_sync(self) -> GitHubProfileStats:
+        """
+        Synchronous wrapper around get_all_stats for callers outside an event loop (e.g. scripts).
+        A temporary HTTP session is used when the aggregator was not given a shared one.
+        """
+        return asyncio.run(self._get_all_stats_with_own_session())
 
-    def get_all_stats(self) -> GitHubProfileStats:
+    async def _get_all_stats_with_own_session(self) -> GitHubProfileStats:
+        if self.api_client.session is not None:
+            return await self.get_all_stats()
+        async with aiohttp.ClientSession() as session:
+            self.api_client.session = session
+            try:
+                return await self.get_all_stats()
+            finally:
+                self.api_client.session = None
+
+    def reset(self):
+        """
+        Forgets the values memoized by the services, so the next call fetches fresh data.
         """
-        Fetches all GitHub profile statistics and returns them as a GitHubProfileStats object.
+        for service in (self.repo_service, self.contribution_service, self.language_service, self.aggregate_service):
+            reset_memo(service)
+
+    async def get_all_stats(self) -> GitHubProfileStats:
+        """
+        Fetches all GitHub profile statistics concurrently and returns them as a GitHubProfileStats object.
+        Concurrent calls share one in-flight fetch. When it completes, the services' memoized values
+        are reset, so the next call fetches fresh data (aggregators are reused across requests).
         """
-        total_stars = self.repo_service.get_total_stars()
-        repo_counts = self.repo_service.get_repo_counts()
-        total_commits = self.contribution_service.get_total_commits()
-        total_contributions = self.contribution_service.get_total_contributions_all_time()
-        
-        streaks = self.contribution_service.get_contribution_streaks()
-        total_prs = self.repo_service.get_total_prs_authored()
-        total_issues = self.repo_service.get_total_issues_authored()
-        estimated_loc_report = self.language_service.get_backend_language_loc()
+        if self._all_stats_task is None:
+            self._all_stats_task = asyncio.ensure_future(self._fetch_all_stats())
+            self._all_stats_task.add_done_callback(self._finish_all_stats)
+        # Shielded so one caller going away doesn't cancel the fetch for the others
+        return await asyncio.shield(self._all_stats_task)
+
+    def _finish_all_stats(self, _task: asyncio.Future):
+        self._all_stats_task = None
+        self.reset()
 
+    async def _fetch_all_stats(self) -> GitHubProfileStats:
+        (
+            profile_bundle,
+            total_stars,
+            total_contributions,
+            authored_counts,
+            estimated_loc_report,
+        ) = await asyncio.gather(
+            # Commits, contribution calendar and repo counts share one GraphQL query
+            self.aggregate_service.fetch_profile_bundle(),
+            self.repo_service.get_total_stars(),
+            self.contribution_service.get_total_contributions_all_time(),
+            self.repo_service.get_authored_counts(),
+            self.language_service.get_backend_language_loc(),
+        )
+        total_commits = profile_bundle["total_commits"]
+        repo_counts = profile_bundle["repo_counts"]
+        total_prs = authored_counts["prs"]
+        total_issues = authored_counts["issues"]
+        streaks = await self.contribution_service.get_contribution_streaks(profile_bundle["contribution_days"])
 
         current_streak_data = None
         if streaks and streaks["current_streak"]:
             try:
-                current_streak_data = StreakData(
-                    start_date=streaks["current_streak"]["start_date"].strftime("%b %d"), # Format date here
-                    end_date=streaks["current_streak"]["end_date"].strftime("%b %d"),     # Format date here
-                    length=streaks["current_streak"]["length"]
-                )
+                # Plain dict: GitHubProfileStats validates it into StreakData once
+                current_streak_data = {
+                    "start_date": _fmt(streaks["current_streak"]["start_date"]), # Format date here
+                    "end_date": _fmt(streaks["current_streak"]["end_date"]),     # Format date here
+                    "length": streaks["current_streak"]["length"]
+                }
             except KeyError as e:
                 logger.warning(f"Missing key in current_streak data: {e}. Raw data was: {streaks['current_streak']}")
                 current_streak_data = None
@@ -56,20 +122,21 @@ class GitHubStatsAggregator:
         longest_streak_data = None
         if streaks and streaks["longest_streak"]:
             try:
-                longest_streak_data = StreakData(
-                    start_date=streaks["longest_streak"]["start_date"].strftime("%b %d"), # Format date here
-                    end_date=streaks["longest_streak"]["end_date"].strftime("%b %d"),     # Format date here
-                    length=streaks["longest_streak"]["length"]
-                )
+                # Plain dict: GitHubProfileStats validates it into StreakData once
+                longest_streak_data = {
+                    "start_date": _fmt(streaks["longest_streak"]["start_date"]), # Format date here
+                    "end_date": _fmt(streaks["longest_streak"]["end_date"]),     # Format date here
+                    "length": streaks["longest_streak"]["length"]
+                }
             except KeyError as e:
                 logger.warning(f"Missing key in longest_streak data: {e}. Raw data was: {streaks['longest_streak']}")
                 longest_streak_data = None
 
-        # initial_date is missing from the current `GitHubProfileStats` initialization.
-        # You'll need to fetch this (e.g., from user profile GraphQL query)
-        # For now, I'll add a placeholder to make the Pydantic model valid.
-        # You would typically add a service method to get this, e.g., self.user_service.get_initial_date()
-        initial_date_placeholder = "Aug 26, 2019" # Replace with actual fetching logic
+        # Account creation date, e.g. "Aug 26, 2019"
+        initial_date = "N/A"
+        if profile_bundle["created_at"]:
+            created_on = date.fromisoformat(profile_bundle["created_at"][:10])
+            initial_date = f"{_fmt(created_on)}, {created_on.year}"
 
         return GitHubProfileStats(
             username=self.username,
@@ -79,7 +146,7 @@ class GitHubStatsAggregator:
             repos_owned=repo_counts["owned"],
             repos_contributed=repo_counts["contributed"],
             repos_total=repo_counts["total"],
-            initial_date=initial_date_placeholder, # Add initial_date
+            initial_date=initial_date,
             current_streak=current_streak_data,
             longest_streak=longest_streak_data,
             total_prs=total_prs,
@@ -0,0 +1,75 @@
+# src/services/aggregate_service.py
+from typing import Dict, Any
+
+from src.config.api_client import GitHubAPIClient
+from src.services.contribution_service import GitHubContributionService
+from src.services.repo_service import GitHubRepoService
+from src.utils.memoize import memoize_async
+from src.utils.logger import get_logger # Import the new logger utility
+
+logger = get_logger(__name__) # Initialize logger for this module
+
+PROFILE_BUNDLE_QUERY = """
+query($username: String!, $from: DateTime!, $to: DateTime!) {
+  user(login: $username) {
+    contributionsCollection(from: $from, to: $to) {
+      totalCommitContributions
+      contributionCalendar {
+        weeks {
+          contributionDays {
+            date
+            contributionCount
+          }
+        }
+      }
+    }
+    repositories(first: 1, ownerAffiliations: OWNER) {
+      totalCount
+    }
+    repositoriesContributedTo(contributionTypes: [COMMIT, PULL_REQUEST, ISSUE], first: 1) {
+      totalCount
+    }
+  }
+}
+"""
+
+class GitHubAggregateService:
+    """
+    Service that fetches the profile fields sharing the same `user` root in a single GraphQL query:
+    total commits, the contribution calendar used for streaks, and repository counts.
+    The calendar window starts at the account creation date when that is less than a year ago.
+    """
+    def __init__(self, api_client: GitHubAPIClient):
+        self.api_client = api_client
+        self.username = api_client.username
+
+    @memoize_async
+    async def fetch_profile_bundle(self) -> Dict[str, Any]:
+        """
+        Fetches commits, contribution days and repository counts in one request.
+
+        Returns:
+            Dict[str, Any]: 'created_at' (ISO timestamp or None), 'total_commits' (int),
+                            'contribution_days' (list of {'date', 'count'}) and 'repo_counts' ({'owned', 'contributed', 'total'}).
+        """
+        created_at = await self.api_client.get_user_created_at()
+        window_from, window_to = GitHubContributionService.calendar_window(created_at)
+        variables = {"username": self.username, "from": window_from, "to": window_to}
+        data = await self.api_client.execute_graphql_query(PROFILE_BUNDLE_QUERY, variables)
+        if 'errors' in data or 'data' not in data or data['data'] is None:
+            logger.error(f" Error fetching profile bundle for {self.username}: {data.get('errors', 'Unknown GraphQL error')}") # Use logger.error
+            return {
+                "created_at": created_at,
+                "total_commits": 0,
+                "contribution_days": [],
+                "repo_counts": {"owned": 0, "contributed": 0, "total": 0},
+            }
+
+        user = data.get('data', {}).get('user') or {}
+        contributions_collection = user.get('contributionsCollection', {})
+        return {
+            "created_at": created_at,
+            "total_commits": contributions_collection.get('totalCommitContributions', 0),
+            "contribution_days": GitHubContributionService.parse_contribution_days(contributions_collection),
+            "repo_counts": GitHubRepoService.parse_repo_counts(user),
+        }
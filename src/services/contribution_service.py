@@ -1,14 +1,32 @@
 # src/services/contribution_service.py
-from datetime import datetime, timedelta
-from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Dict, Any, List, Tuple
 
 from src.config.api_client import GitHubAPIClient
 from src.services.streak_calculator import StreakCalculator # Import the new streak calculator
+from src.utils.memoize import memoize_async
 from src.utils.logger import get_logger # Import the new logger utility
 
 logger = get_logger(__name__) # Initialize logger for this module
 
+CONTRIBUTION_CALENDAR_QUERY = """
+query($username: String!, $from: DateTime!, $to: DateTime!) {
+  user(login: $username) {
+    contributionsCollection(from: $from, to: $to) {
+      contributionCalendar {
+        weeks {
+          contributionDays {
+            date
+            contributionCount
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
 class GitHubContributionService:
     """
     Service responsible for fetching raw contribution-related data from GitHub.
@@ -17,27 +35,9 @@ class GitHubContributionService:
     def __init__(self, api_client: GitHubAPIClient):
         self.api_client = api_client
         self.username = api_client.username
+        self._vars = {"username": self.username} # Shared GraphQL variables for the username-only queries
         self.streak_calculator = StreakCalculator() # Initialize StreakCalculator here
 
-    def get_total_commits(self) -> int:
-        """
-        Fetches the total number of commit contributions using GraphQL.
-        """
-        query = f"""
-        {{
-          user(login: "{self.username}") {{
-            contributionsCollection {{
-              totalCommitContributions
-            }}
-          }}
-        }}
-        """
-        data = self.api_client.execute_graphql_query(query)
-        if 'errors' in data or 'data' not in data or data['data'] is None:
-            logger.error(f" Error fetching total commits for {self.username}: {data.get('errors', 'Unknown GraphQL error')}") # Use logger.error
-            return 0
-        return data.get('data', {}).get('user', {}).get('contributionsCollection', {}).get('totalCommitContributions', 0)
-
     def _get_batched_year_ranges(self, start_year: int) -> List[Tuple[str, str]]:
         """
         Generates year ranges for batch fetching contributions to avoid API limits.
@@ -50,99 +50,106 @@ class GitHubContributionService:
             year_ranges.append((start_date, end_date))
         return year_ranges
 
-    def get_total_contributions_all_time(self) -> int:
+    @memoize_async
+    async def get_total_contributions_all_time(self) -> int:
         """
-        Fetches total contributions by year, then sums them up.
+        Fetches total contributions for every year in a single batched GraphQL query, then sums them up.
         This includes commits, issues, pull requests, and reviews.
         """
-        total_contributions = 0
         # Determine the user's first contribution year or a reasonable starting point
         # For simplicity, let's assume a fixed start year or fetch it if possible.
         # In a real app, you might get the user's creation date.
         first_contribution_year = 2008 # GitHub started in 2008, so a safe lower bound
 
         year_ranges = self._get_batched_year_ranges(first_contribution_year)
+        query = self._build_yearly_contributions_query(tuple(year_ranges))
+        data = await self.api_client.execute_graphql_query(query, self._vars)
 
-        with ThreadPoolExecutor(max_workers=5) as executor:
-            # Map each year range to a call that fetches contributions for that period
-            futures = [
-                executor.submit(self._fetch_contributions_for_period, start_date, end_date)
-                for start_date, end_date in year_ranges
-            ]
-            for future in futures:
-                try:
-                    total_contributions += future.result()
-                except Exception as e:
-                    logger.error(f"Error fetching contributions for a period: {e}", exc_info=True)
+        if 'errors' in data:
+            # GraphQL reports a failing year alongside the data for the others, so only that year is lost
+            logger.error(f" Error fetching yearly contributions for {self.username}: {data['errors']}") # Use logger.error
+        if not data.get('data'):
+            return 0
 
-        return total_contributions
+        user = data['data'].get('user') or {}
+        return sum(
+            (collection or {}).get('contributionCalendar', {}).get('totalContributions', 0)
+            for collection in user.values()
+        )
 
-    def _fetch_contributions_for_period(self, from_date: str, to_date: str) -> int:
+    @staticmethod
+    @lru_cache(maxsize=4)
+    def _build_yearly_contributions_query(year_ranges: Tuple[Tuple[str, str], ...]) -> str:
         """
-        Fetches total contributions within a specific date range using GraphQL.
+        Builds one GraphQL document with an aliased contributionsCollection (y2008, y2009, ...) per year range.
+        The ranges only change at the turn of the year, so the document is built once and reused.
         """
-        query = f"""
-        query($username: String!, $from: DateTime!, $to: DateTime!) {{
-          user(login: $username) {{
-            contributionsCollection(from: $from, to: $to) {{
+        collections = "\n".join(
+            f'''            y{from_date[:4]}: contributionsCollection(from: "{from_date}", to: "{to_date}") {{
               contributionCalendar {{
                 totalContributions
               }}
-            }}
+            }}'''
+            for from_date, to_date in year_ranges
+        )
+        return f"""
+        query($username: String!) {{
+          user(login: $username) {{
+{collections}
           }}
         }}
         """
-        variables = {
-            "username": self.username,
-            "from": from_date,
-            "to": to_date
-        }
-        data = self.api_client.execute_graphql_query(query, variables)
 
-        if 'errors' in data or 'data' not in data or data['data'] is None:
-            logger.error(f" Error fetching contributions for period {from_date} to {to_date}: {data.get('errors', 'Unknown GraphQL error')}") # Use logger.error
-            return 0
-        
-        return data.get('data', {}).get('user', {}).get('contributionsCollection', {}).get('contributionCalendar', {}).get('totalContributions', 0)
-
-    def get_contribution_days_data(self) -> List[Dict[str, Any]]:
+    @memoize_async
+    async def get_contribution_days_data(self) -> List[Dict[str, Any]]:
         """
         Fetches all individual contribution days with their counts for streak calculation.
         """
-        query = f"""
-        {{
-          user(login: "{self.username}") {{
-            contributionsCollection {{
-              contributionCalendar {{
-                weeks {{
-                  contributionDays {{
-                    date
-                    contributionCount
-                  }}
-                }}
-              }}
-            }}
-          }}
-        }}
-        """
-        data = self.api_client.execute_graphql_query(query)
+        created_at = await self.api_client.get_user_created_at()
+        window_from, window_to = self.calendar_window(created_at)
+        variables = {"username": self.username, "from": window_from, "to": window_to}
+        data = await self.api_client.execute_graphql_query(CONTRIBUTION_CALENDAR_QUERY, variables)
         if 'errors' in data or 'data' not in data or data['data'] is None:
             logger.error(f" Error fetching contribution calendar for streaks for {self.username}: {data.get('errors', 'Unknown GraphQL error')}") # Use logger.error
             return []
 
+        return self.parse_contribution_days(data.get('data', {}).get('user', {}).get('contributionsCollection', {}))
+
+    @staticmethod
+    def calendar_window(created_at: str | None) -> Tuple[str, str]:
+        """
+        (from, to) of the contribution calendar window: the last 365 days including today, starting at
+        the account creation day if that is later, so no padding days from before the account existed
+        are returned. `to` is explicit because GitHub otherwise ends the window one year after `from`,
+        which would cut off today. Both bounds are whole UTC days, so the query variables, and therefore
+        cached responses, stay stable for the whole day.
+        """
+        today = datetime.now(timezone.utc).date()
+        start = today - timedelta(days=364)
+        if created_at:
+            start = max(start, datetime.fromisoformat(created_at.replace("Z", "+00:00")).date())
+        return f"{start.isoformat()}T00:00:00Z", f"{today.isoformat()}T23:59:59Z"
+
+    @staticmethod
+    def parse_contribution_days(contributions_collection: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Flattens a contributionsCollection's weekly calendar into a list of {'date', 'count'} dictionaries.
+        """
         days = [
             {
                 'date': day['date'],
                 'count': day['contributionCount']
             }
-            for week in data.get('data', {}).get('user', {}).get('contributionsCollection', {}).get('contributionCalendar', {}).get('weeks', [])
+            for week in contributions_collection.get('contributionCalendar', {}).get('weeks', [])
             for day in week.get('contributionDays', [])
         ]
         return days
 
-    def get_contribution_streaks(self) -> Dict[str, Any]:
+    async def get_contribution_streaks(self, contribution_days_data: List[Dict[str, Any]] | None = None) -> Dict[str, Any]:
         """
-        Fetches raw contribution day data and then calculates the current and longest streaks.
+        Calculates the current and longest streaks from contribution day data,
+        fetching the raw data first unless it was already provided.
         """
-        contribution_days_data = self.get_contribution_days_data()
+        if contribution_days_data is None:
+            contribution_days_data = await self.get_contribution_days_data()
         return self.streak_calculator.calculate_streaks(contribution_days_data)
\ No newline at end of file
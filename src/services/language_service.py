@@ -1,9 +1,13 @@
 # src/services/language_service.py
-from typing import Dict, Any, List
+import asyncio
+from typing import Dict, Any
 from collections import defaultdict
 from src.config.api_client import GitHubAPIClient
+from src.config.config import CACHE_DIR
+from src.cache.cache_manager import write_file_atomic
+import hashlib
 import os
-import json
+import orjson
 # Removed: import logging
 
 # Setup logger
@@ -11,6 +15,7 @@ import json
 # Removed:     level=logging.INFO,
 # Removed:     format="%(asctime)s | %(levelname)s | %(message)s"
 # Removed: )
+from src.utils.memoize import memoize_async
 from src.utils.logger import get_logger # Import the new logger utility
 logger = get_logger(__name__) # Initialize logger for this module
 
@@ -26,6 +31,41 @@ AVG_BYTES_PER_LINE = {
     "Solidity": 25, "C++": 10, "Jupyter Notebook": 550
 }
 
+# Reported language for each counted one (notebooks are folded into Python)
+LOC_REPORT_LANGUAGE = {
+    lang: "Python" if lang == "Jupyter Notebook" else lang
+    for lang in BACKEND_LANGUAGES
+}
+
+LANGUAGE_LOC_CACHE_FILE = os.path.join(CACHE_DIR, "approx_backend_language_loc_cache.json")
+
+# Digest of the report last written to LANGUAGE_LOC_CACHE_FILE (None until first checked)
+_language_report_digest: bytes | None = None
+
+def _save_language_report(report: Dict[str, Any]):
+    """
+    Writes the LOC report to LANGUAGE_LOC_CACHE_FILE atomically, skipping the write when the content is unchanged.
+    Blocking; run in a worker thread.
+    """
+    global _language_report_digest
+    payload = orjson.dumps(report)
+    digest = hashlib.blake2b(payload, digest_size=16).digest()
+    if _language_report_digest is None:
+        try:
+            with open(LANGUAGE_LOC_CACHE_FILE, "rb") as f:
+                _language_report_digest = hashlib.blake2b(f.read(), digest_size=16).digest()
+        except FileNotFoundError:
+            pass
+    if digest == _language_report_digest:
+        return
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        write_file_atomic(LANGUAGE_LOC_CACHE_FILE, payload)
+        _language_report_digest = digest
+        logger.info(f" LOC and percentage report saved to {LANGUAGE_LOC_CACHE_FILE}")
+    except OSError as e:
+        logger.error(f"Error saving language LOC cache: {e}", exc_info=True)
+
 class GitHubLanguageService:
     """
     Service for estimating lines of code and usage percentages of backend languages.
@@ -35,55 +75,38 @@ class GitHubLanguageService:
         self.api_client = api_client
         self.username = api_client.username
 
-    def _get_all_user_repos(self) -> List[Dict[str, Any]]:
-        """Fetch all public, non-fork repos owned by the user."""
-        all_repos = []
-        page = 1
-
-        while True:
-            try:
-                repos = self.api_client.get_user_repos(page=page, per_page=100)
-                if not repos:
-                    break
-
-                for repo in repos:
-                    # Only include owned, non-fork repositories
-                    if repo.get("owner", {}).get("login") == self.username and not repo.get("fork"):
-                        all_repos.append(repo)
-                page += 1
-            except Exception as e:
-                logger.error(f"Error fetching user repositories for {self.username} (page {page}): {e}", exc_info=True)
-                break
-        return all_repos
-
-    def get_backend_language_loc(self) -> Dict[str, Any]:
+    @memoize_async
+    async def get_backend_language_loc(self) -> Dict[str, Any]:
         """
         Estimates lines of code for specified backend languages across all owned, non-fork repos.
+        Repositories and their language sizes are fetched 100 at a time via GraphQL.
         Caches the result.
         """
+        # Bytes are summed per language and converted to lines once, after all pages are read
+        language_bytes = defaultdict(int)
+        cursor = None
+
+        while True:
+            repositories = await self.api_client.get_user_repos_with_languages_graphql(cursor)
+
+            for repo in repositories.get("nodes") or []:
+                # Only include owned, non-fork repositories
+                if repo.get("isFork") or (repo.get("owner") or {}).get("login") != self.username:
+                    continue
+
+                for edge in (repo.get("languages") or {}).get("edges") or []:
+                    lang = edge.get("node", {}).get("name")
+                    if lang in BACKEND_LANGUAGES:
+                        language_bytes[lang] += edge.get("size", 0)
+
+            page_info = repositories.get("pageInfo") or {}
+            if not page_info.get("hasNextPage"):
+                break
+            cursor = page_info.get("endCursor")
+
         language_loc = defaultdict(int)
-        all_repos = self._get_all_user_repos()
-
-        for repo in all_repos:
-            repo_name = repo.get("name")
-            owner_name = repo.get("owner", {}).get("login")
-            if not repo_name or not owner_name:
-                logger.warning(f"Skipping malformed repository data: {repo}")
-                continue
-
-            try:
-                lang_data = self.api_client.get_repo_languages(owner_name, repo_name)
-            except Exception as e:
-                logger.error(f"Error fetching languages for {owner_name}/{repo_name}: {e}", exc_info=True)
-                continue
-
-            for lang, bytes_count in lang_data.items():
-                if lang in BACKEND_LANGUAGES:
-                    est_loc = int(bytes_count // AVG_BYTES_PER_LINE.get(lang, 60))
-                    if lang == "Jupyter Notebook":
-                        language_loc["Python"] += est_loc
-                    else:
-                        language_loc[lang] += est_loc
+        for lang, bytes_count in language_bytes.items():
+            language_loc[LOC_REPORT_LANGUAGE[lang]] += bytes_count // AVG_BYTES_PER_LINE[lang]
 
         # Clean and compute total
         language_loc = {lang: loc for lang, loc in language_loc.items() if loc > 0}
@@ -106,14 +129,7 @@ class GitHubLanguageService:
             )
         )
 
-        # Optional: Save to cache (mimicking original script)
-        os.makedirs("cache", exist_ok=True)
-        try:
-            with open("cache/approx_backend_language_loc_cache.json", "w") as f:
-                json.dump(sorted_language_report, f, indent=4)
-            logger.info(" LOC and percentage report saved to cache/approx_backend_language_loc_cache.json")
-        except IOError as e:
-            logger.error(f"Error saving language LOC cache: {e}", exc_info=True)
-
+        # Optional: Save to cache (mimicking original script), off the event loop
+        await asyncio.to_thread(_save_language_report, sorted_language_report)
 
         return sorted_language_report
\ No newline at end of file
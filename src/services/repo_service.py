@@ -2,10 +2,38 @@
 from typing import Dict, Any, List
 
 from src.config.api_client import GitHubAPIClient # Import the new API client
+from src.utils.memoize import memoize_async
 from src.utils.logger import get_logger # Import the new logger utility
 
 logger = get_logger(__name__) # Initialize logger for this module
 
+AUTHORED_COUNTS_QUERY = """
+query($prQuery: String!, $issueQuery: String!) {
+  prs: search(query: $prQuery, type: ISSUE) {
+    issueCount
+  }
+  issues: search(query: $issueQuery, type: ISSUE) {
+    issueCount
+  }
+}
+"""
+
+STARGAZERS_QUERY = """
+query($username: String!, $cursor: String) {
+  user(login: $username) {
+    repositories(first: 100, after: $cursor, ownerAffiliations: OWNER, privacy: PUBLIC, isFork: false) {
+      pageInfo {
+        hasNextPage
+        endCursor
+      }
+      nodes {
+        stargazerCount
+      }
+    }
+  }
+}
+"""
+
 class GitHubRepoService:
     """
     Service responsible for fetching repository-related statistics.
@@ -15,46 +43,35 @@ class GitHubRepoService:
         self.api_client = api_client
         self.username = api_client.username # Get username from API client
 
-    def get_total_stars(self) -> int:
+    @memoize_async
+    async def get_total_stars(self) -> int:
         """
-        Fetches the total number of stars across all public repositories owned by the user.
+        Fetches the total number of stars across all public, non-fork repositories owned by the user,
+        paginating the GraphQL repositories connection 100 at a time.
         """
         total_stars = 0
-        page = 1
+        cursor = None
         while True:
-            repos = self.api_client.get_user_repos(page=page)
-            if not repos or not isinstance(repos, list) or "error" in repos:
-                # Handle API errors or no more repos
-                if "error" in repos:
-                    logger.error(f"Error fetching user repos for total stars: {repos['error']}")
+            # Only the star count is selected, 100 repositories per page
+            data = await self.api_client.execute_graphql_query(STARGAZERS_QUERY, {"username": self.username, "cursor": cursor})
+            if 'errors' in data or 'data' not in data or data['data'] is None:
+                logger.error(f" Error fetching stargazer counts for {self.username}: {data.get('errors', 'Unknown GraphQL error')}") # Use logger.error
+                break
+            repositories = (data['data'].get('user') or {}).get('repositories') or {}
+            for repo in repositories.get('nodes') or []:
+                total_stars += repo.get('stargazerCount', 0)
+
+            page_info = repositories.get('pageInfo') or {}
+            if not page_info.get('hasNextPage'):
                 break
-            for repo in repos:
-                total_stars += repo.get('stargazers_count', 0)
-            page += 1
+            cursor = page_info.get('endCursor')
         return total_stars
 
-    def get_repo_counts(self) -> Dict[str, int]:
+    @staticmethod
+    def parse_repo_counts(user: Dict[str, Any]) -> Dict[str, int]:
         """
-        Fetches the count of owned, contributed, and total repositories using GraphQL.
+        Builds the owned/contributed/total repository counts from a GraphQL user node.
         """
-        query = f"""
-        {{
-          user(login: "{self.username}") {{
-            repositories(first: 1, ownerAffiliations: OWNER) {{
-              totalCount
-            }}
-            repositoriesContributedTo(contributionTypes: [COMMIT, PULL_REQUEST, ISSUE], first: 1) {{
-              totalCount
-            }}
-          }}
-        }}
-        """
-        data = self.api_client.execute_graphql_query(query)
-        if 'errors' in data or 'data' not in data or data['data'] is None:
-            logger.error(f" Error fetching repo counts for {self.username}: {data.get('errors', 'Unknown GraphQL error')}") # Use logger.error
-            return {"owned": 0, "contributed": 0, "total": 0}
-
-        user = data.get('data', {}).get('user', {})
         owned = user.get('repositories', {}).get('totalCount', 0)
         contributed = user.get('repositoriesContributedTo', {}).get('totalCount', 0)
         return {
@@ -63,30 +80,36 @@ class GitHubRepoService:
             'total': owned + contributed
         }
 
-    def get_total_prs_authored(self) -> int:
+    @memoize_async
+    async def get_authored_counts(self) -> Dict[str, int]:
+        """
+        Fetches the number of Pull Requests and Issues authored by the user with one GraphQL search request.
+        Memoized, so get_total_prs_authored and get_total_issues_authored share the request.
+
+        Returns:
+            Dict[str, int]: {'prs': ..., 'issues': ...}
+        """
+        variables = {
+            "prQuery": f"type:pr author:{self.username}",
+            "issueQuery": f"type:issue author:{self.username}",
+        }
+        data = await self.api_client.execute_graphql_query(AUTHORED_COUNTS_QUERY, variables)
+        if 'errors' in data or 'data' not in data or data['data'] is None:
+            logger.error(f" Error fetching authored PR/Issue counts for {self.username}: {data.get('errors', 'Unknown GraphQL error')}") # Use logger.error
+            return {"prs": 0, "issues": 0}
+        return {
+            "prs": (data['data'].get('prs') or {}).get('issueCount', 0),
+            "issues": (data['data'].get('issues') or {}).get('issueCount', 0),
+        }
+
+    async def get_total_prs_authored(self) -> int:
         """
-        Fetches the total number of Pull Requests authored by the user using the Search API.
+        Fetches the total number of Pull Requests authored by the user (see get_authored_counts).
         """
-        url = "https://api.github.com/search/issues"
-        query_params = {'q': f'type:pr author:{self.username}'}
-        
-        data = self.api_client._make_request("GET", url, params=query_params)
-        
-        if "error" in data:
-            logger.error(f" Error fetching total PRs for {self.username}: {data.get('error')}") # Use logger.error
-            return 0
-        return data.get('total_count', 0)
+        return (await self.get_authored_counts())["prs"]
 
-    def get_total_issues_authored(self) -> int:
+    async def get_total_issues_authored(self) -> int:
         """
-        Fetches the total number of Issues authored by the user using the Search API.
+        Fetches the total number of Issues authored by the user (see get_authored_counts).
         """
-        url = "https://api.github.com/search/issues"
-        query_params = {'q': f'type:issue author:{self.username}'}
-        
-        data = self.api_client._make_request("GET", url, params=query_params)
-        
-        if "error" in data:
-            logger.error(f" Error fetching total Issues for {self.username}: {data.get('error')}") # Use logger.error
-            return 0
-        return data.get('total_count', 0)
\ No newline at end of file
+        return (await self.get_authored_counts())["issues"]
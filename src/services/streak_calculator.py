@@ -1,12 +1,19 @@
 # src/services/streak_calculator.py
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from collections import namedtuple
-from typing import Dict, Any, List, Optional
+from itertools import groupby
+from typing import ClassVar, Dict, Any, List, Optional
+
+def _is_active(count: int) -> bool:
+    """groupby key for daily contribution counts: True on days with at least one contribution."""
+    return count > 0
 
 class StreakCalculator:
     """
     Calculates current and longest contribution streaks from raw contribution day data.
     """
+    _ONE_DAY: ClassVar[timedelta] = timedelta(days=1)
+
     def __init__(self):
         self.Streak = namedtuple('Streak', ['start_date', 'end_date', 'length'])
 
@@ -24,22 +31,31 @@ class StreakCalculator:
                             each being a dictionary with 'start_date', 'end_date', and 'length',
                             or a default dictionary for current_streak if none.
         """
-        days_processed = []
-        for day in contribution_days:
-            try:
-                date = datetime.strptime(day['date'], '%Y-%m-%d').date()
-                count = day['count']
-                days_processed.append({'date': date, 'count': count})
-            except (ValueError, TypeError) as e:
-                print(f" Skipping invalid contribution day data: {day} - {e}")
-                continue
-
-        # Sort days by date in ascending order
-        days_processed.sort(key=lambda x: x['date'])
+        # Dates and counts are kept as two parallel lists rather than one dict per day
+        try:
+            # Fast path: GitHub always returns ISO dates, so parse them all without per-day exception handling
+            dates = [date.fromisoformat(day['date']) for day in contribution_days]
+            counts = [day['count'] for day in contribution_days]
+        except (ValueError, TypeError, KeyError):
+            dates = []
+            counts = []
+            for day in contribution_days:
+                try:
+                    day_date = date.fromisoformat(day['date'])
+                    count = day['count']
+                except (ValueError, TypeError, KeyError) as e:
+                    print(f" Skipping invalid contribution day data: {day} - {e}")
+                    continue
+                dates.append(day_date)
+                counts.append(count)
+
+        # The contribution calendar is returned week by week in ascending date order, so no sort is needed
+        assert all(prev < cur for prev, cur in zip(dates, dates[1:])), \
+            "contribution days must be in ascending date order"
 
         # Calculate streaks
-        longest_streak_obj = self._calculate_longest_streak(days_processed)
-        current_streak_obj = self._calculate_current_streak(days_processed)
+        longest_streak_obj = self._calculate_longest_streak(dates, counts)
+        current_streak_obj = self._calculate_current_streak(dates, counts)
 
         # Convert namedtuple to dictionary for Pydantic compatibility
         # If current_streak_obj is None, provide default values as requested
@@ -55,103 +71,66 @@ class StreakCalculator:
             "current_streak": current_streak_output
         }
 
-    def _calculate_longest_streak(self, days: List[Dict[str, Any]]) -> Optional[Any]:
+    def _calculate_longest_streak(self, dates: List[date], counts: List[int]) -> Optional[Any]:
         """
-        Calculates the longest streak of consecutive contribution days.
+        Calculates the longest streak of consecutive contribution days by run-length encoding the calendar.
         """
-        if not days:
-            return None
-
-        longest_length = 0
-        longest_start_date = None
-        longest_end_date = None
-
-        current_length = 0
-        current_start_date = None
-
-        for i in range(len(days)):
-            if days[i]['count'] > 0:
-                if current_length == 0:
-                    current_start_date = days[i]['date']
-                current_length += 1
-            else:
-                if current_length > longest_length:
-                    longest_length = current_length
-                    longest_start_date = current_start_date
-                    longest_end_date = days[i-1]['date'] if i > 0 else current_start_date
-                current_length = 0
-                current_start_date = None
-
-        # Check after loop for the last streak
-        if current_length > longest_length:
-            longest_length = current_length
-            longest_start_date = current_start_date
-            longest_end_date = days[-1]['date']
-
-        if longest_length > 0:
+        best_length = 0
+        best_start = 0
+
+        # Run-length encode the counts into active/inactive runs and keep the first longest active one
+        run_start = 0
+        for active, run in groupby(counts, key=_is_active):
+            run_length = sum(1 for _ in run)
+            if active and run_length > best_length:
+                best_length = run_length
+                best_start = run_start
+            run_start += run_length
+
+        if best_length > 0:
             return self.Streak(
-                start_date=longest_start_date,
-                end_date=longest_end_date,
-                length=longest_length
+                start_date=dates[best_start],
+                end_date=dates[best_start + best_length - 1],
+                length=best_length
             )
         return None
 
-    def _calculate_current_streak(self, days: List[Dict[str, Any]]) -> Optional[Any]:
+    def _calculate_current_streak(self, dates: List[date], counts: List[int]) -> Optional[Any]:
         """
         Calculates the current consecutive streak of contribution days ending today or yesterday.
         Returns a Streak namedtuple or None if no streak is found.
         """
-        if not days:
-            return None
-
         today = datetime.now().date()
-        yesterday = today - timedelta(days=1)
-
-        # Filter days to include only up to today/yesterday for current streak calculation
-        relevant_days = [d for d in days if d['date'] <= today]
-        relevant_days.sort(key=lambda x: x['date'], reverse=True) # Process from most recent
+        yesterday = today - self._ONE_DAY
 
-        current_length = 0
-        current_end_date = None
-        current_start_date = None
-        
+        length = 0
+        start_date = None
+        end_date = None
         expected_date = today
 
-        for day_data in relevant_days:
-            day_date = day_data['date']
-            day_count = day_data['count']
-
-            if day_date == expected_date:
-                if day_count > 0:
-                    if current_length == 0:
-                        current_end_date = day_date
-                    current_length += 1
-                    current_start_date = day_date # Update start date as we go backward
-                    expected_date -= timedelta(days=1)
-                else:
-                    # Contribution count is 0 for an expected day, streak breaks
-                    break
-            elif day_date < expected_date:
-                # We've skipped a day with 0 contributions, so the streak is broken
-                if expected_date == today and day_date == yesterday and day_count > 0:
-                    # Edge case: today has no contribution, but yesterday does,
-                    # and we are looking for a streak ending yesterday.
-                    if current_length == 0:
-                        current_end_date = day_date
-                    current_length += 1
-                    current_start_date = day_date
-                    expected_date -= timedelta(days=1)
-                else:
-                    # If we found an older date with a gap, the streak is broken.
-                    break
-            else:
-                # day_date > expected_date, this shouldn't happen with sorted and filtered data
+        # Walk back from the most recent day and stop at the first gap, so only the streak itself is visited
+        for i in range(len(dates) - 1, -1, -1):
+            day_date = dates[i]
+            if day_date > today:
                 continue
+            count = counts[i]
+            if day_date == expected_date and count > 0:
+                if length == 0:
+                    end_date = day_date
+                length += 1
+                start_date = day_date
+                expected_date -= self._ONE_DAY
+            elif length == 0 and day_date == yesterday and count > 0:
+                # Today is missing from the calendar but yesterday has contributions: a one-day streak
+                return self.Streak(start_date=day_date, end_date=day_date, length=1)
+            else:
+                # A day without contributions (including today) or a skipped date breaks the streak
+                break
 
-        if current_length > 0 and current_end_date:
+        if length > 0:
             return self.Streak(
-                start_date=current_start_date,
-                end_date=current_end_date,
-                length=current_length
+                start_date=start_date,
+                end_date=end_date,
+                length=length
             )
-        return None
\ No newline at end of file
+        return None
@@ -1,6 +1,7 @@
 # src/svg_util/svg_util.py
-import json
-from src.config.config import get_cache_file
+import heapq
+from collections import namedtuple
+from dataclasses import dataclass, fields
 from src.utils.logger import get_logger # Import the new logger utility
 
 logger = get_logger(__name__) # Initialize logger for this module
@@ -10,35 +11,59 @@ SVG_WIDTH = 570
 MAX_LANGUAGES = 6
 LANG_BAR_COLORS = ["#FF5F1F", "#FFA500", "#F4BB44", "#FFD580", "#FFDEAD", "#FBCEB1", "#FBD5BC"]
 LANG_TEXT_X = [5, 135, 245, 330, 400, 480]
+LANG_TEXT_X_LEN = len(LANG_TEXT_X)
+LANG_COLORS_LEN = len(LANG_BAR_COLORS)
 
-class GitHubSVGUtil:
-    def load_stats_from_json(json_path):
+# One segment of the language bar (and its legend entry)
+LanguageBar = namedtuple("LanguageBar", ["name", "percent", "width", "rect_x", "text_x", "fill"])
+
+@dataclass(slots=True, frozen=True)
+class StatsPayload:
+    """
+    Context for template.svg. Supports keys() and item access so it can still be passed as **payload.
+    """
+    user_name: str
+    total_stars: str
+    total_commits: str
+    total_prs: int
+    total_issues: int
+    contributed_repos: int
+    user_rating: str
+    total_contributions: str
+    contribution_period: str
+    current_streak: int
+    current_streak_dates: str
+    longest_streak: int
+    longest_streak_dates: str
+    languages: tuple[LanguageBar, ...]
+    total_language_percent: float
+
+    def keys(self):
+        return _STATS_PAYLOAD_FIELDS
+
+    def __getitem__(self, key: str):
         try:
-            with open(json_path, "r") as f:
-                raw = json.load(f)
-            stats = raw["stats"]
-        except FileNotFoundError:
-            logger.error(f"SVGUtil: JSON cache file not found at {json_path}")
-            return {} # Or raise an error, depending on desired behavior
-        except json.JSONDecodeError as e:
-            logger.error(f"SVGUtil: Error decoding JSON from {json_path}: {e}")
-            return {}
-        except KeyError as e:
-            logger.error(f"SVGUtil: Missing expected key in JSON data: {e}")
-            return {}
-        except Exception as e:
-            logger.error(f"SVGUtil: An unexpected error occurred loading JSON: {e}")
-            return {}
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
 
+_STATS_PAYLOAD_FIELDS = tuple(f.name for f in fields(StatsPayload))
+
+class GitHubSVGUtil:
+    @staticmethod
+    def build_template_data(stats: dict) -> StatsPayload:
+        """
+        Transforms a GitHubProfileStats dictionary into the context expected by template.svg.
+        """
         # Extract data
         username = stats.get("username", "Unknown User")
         user_name = username.replace("-", " ").title()
-        total_stars = f"{stats.get('total_stars', 0):,}34"
-        total_commits = f"{stats.get('total_commits', 0):,}"
+        total_stars = format(stats.get('total_stars', 0), ",")
+        total_commits = format(stats.get('total_commits', 0), ",")
         total_prs = stats.get("total_prs", 0)
         total_issues = stats.get("total_issues", 0)
         contributed_repos = stats.get("repos_total", 0)
-        total_contributions = f"{stats.get('total_contributions', 0):,}"
+        total_contributions = format(stats.get('total_contributions', 0), ",")
         contribution_period = f"{stats.get('initial_date', 'N/A')} - Present"
 
         # Handle streaks, providing default empty dicts if None
@@ -63,38 +88,47 @@ class GitHubSVGUtil:
 
         # Prepare language bar data
         lang_report = stats.get("Languages", {})
-        sorted_langs = sorted(lang_report.items(), key=lambda x: -x[1].get("percentage", 0))[:MAX_LANGUAGES]
+        # Top MAX_LANGUAGES by percentage without sorting the whole report
+        sorted_langs = heapq.nlargest(MAX_LANGUAGES, lang_report.items(), key=lambda kv: kv[1].get("percentage", 0))
+
+        # Bind the loop's globals and builtins to locals (LOAD_FAST instead of dict lookups)
+        _round = round
+        text_x, text_x_len = LANG_TEXT_X, LANG_TEXT_X_LEN
+        colors, colors_len = LANG_BAR_COLORS, LANG_COLORS_LEN
+        svg_width = SVG_WIDTH
 
         x_cursor = 0
+        total_percent = 0 # Sum of displayed language percentages
         languages = []
+        append = languages.append
         for i, (lang, details) in enumerate(sorted_langs):
-            percent = round(details.get("percentage", 0), 1)
-            width = round((percent / 100) * SVG_WIDTH, 2)
-            lang_data = {
-                "name": lang,
-                "percent": percent,
-                "width": width,
-                "rect_x": x_cursor,
-                "text_x": LANG_TEXT_X[i % len(LANG_TEXT_X)], # Use modulo for safety
-                "fill": LANG_BAR_COLORS[i % len(LANG_BAR_COLORS)],
-            }
+            percent = _round(details.get("percentage", 0), 1)
+            total_percent += percent
+            width = _round((percent / 100) * svg_width, 2)
+            append(LanguageBar(
+                name=lang,
+                percent=percent,
+                width=width,
+                rect_x=x_cursor,
+                text_x=text_x[i % text_x_len], # Use modulo for safety
+                fill=colors[i % colors_len],
+            ))
             x_cursor += width
-            languages.append(lang_data)
-
-        return {
-            "user_name": str.upper(user_name),
-            "total_stars": total_stars,
-            "total_commits": total_commits,
-            "total_prs": total_prs,
-            "total_issues": total_issues,
-            "contributed_repos": contributed_repos,
-            "user_rating": user_rating,
-            "total_contributions": total_contributions,
-            "contribution_period": contribution_period,
-            "current_streak": current_streak,
-            "current_streak_dates": current_streak_dates,
-            "longest_streak": longest_streak,
-            "longest_streak_dates": longest_streak_dates,
-            "languages": languages,
-            "total_language_percent": sum(lang['percent'] for lang in languages) # Sum of displayed language percentages
-        }
\ No newline at end of file
+
+        return StatsPayload(
+            user_name=user_name.upper(),
+            total_stars=total_stars,
+            total_commits=total_commits,
+            total_prs=total_prs,
+            total_issues=total_issues,
+            contributed_repos=contributed_repos,
+            user_rating=user_rating,
+            total_contributions=total_contributions,
+            contribution_period=contribution_period,
+            current_streak=current_streak,
+            current_streak_dates=current_streak_dates,
+            longest_streak=longest_streak,
+            longest_streak_dates=longest_streak_dates,
+            languages=tuple(languages), # Immutable, like the frozen payload holding it
+            total_language_percent=total_percent
+        )
\ No newline at end of file
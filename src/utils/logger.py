@@ -1,5 +1,27 @@
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
+
+# Handlers are created once and shared by every logger returned from get_logger
+LOG_DIR = "logs"
+os.makedirs(LOG_DIR, exist_ok=True)
+
+_FORMATTER = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+_CONSOLE_HANDLER = logging.StreamHandler()
+_CONSOLE_HANDLER.setFormatter(_FORMATTER)
+
+_FILE_HANDLER = logging.FileHandler(os.path.join(LOG_DIR, "app.log"))
+_FILE_HANDLER.setFormatter(_FORMATTER)
+
+# Loggers only enqueue records; a background listener thread does the console and file I/O
+_LOG_QUEUE = queue.SimpleQueue()
+_QUEUE_HANDLER = logging.handlers.QueueHandler(_LOG_QUEUE)
+_LISTENER = logging.handlers.QueueListener(_LOG_QUEUE, _CONSOLE_HANDLER, _FILE_HANDLER, respect_handler_level=True)
+_LISTENER.start()
+atexit.register(_LISTENER.stop) # Flush queued records on interpreter exit
 
 def get_logger(name: str) -> logging.Logger:
     """
@@ -12,21 +34,12 @@ def get_logger(name: str) -> logging.Logger:
         logging.Logger: A configured logger instance.
     """
     logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO) # Default logging level
 
     # Ensure handlers are not duplicated if called multiple times
     if not logger.handlers:
-        # Create a console handler
-        console_handler = logging.StreamHandler()
-        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        console_handler.setFormatter(formatter)
-        logger.addHandler(console_handler)
-
-        # Optional: Add a file handler
-        log_dir = "logs"
-        os.makedirs(log_dir, exist_ok=True)
-        file_handler = logging.FileHandler(os.path.join(log_dir, "app.log"))
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
-
-    return logger
\ No newline at end of file
+        logger.addHandler(_QUEUE_HANDLER)
+        logger.setLevel(logging.INFO) # Default logging level
+        # Records are fully handled here; don't let the root logger emit them again
+        logger.propagate = False
+
+    return logger
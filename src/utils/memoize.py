@@ -0,0 +1,32 @@
+# src/utils/memoize.py
+import asyncio
+import functools
+
+def memoize_async(method):
+    """
+    Memoizes a no-argument async method per instance.
+
+    The first call starts the request as a task; concurrent and later calls await the same task,
+    so each value is fetched at most once until reset_memo() is called on the instance.
+    Calls that raise are not remembered.
+    """
+    name = method.__name__
+
+    @functools.wraps(method)
+    async def wrapper(self):
+        memo = self.__dict__.setdefault("_memo", {})
+        task = memo.get(name)
+        if task is None:
+            task = memo[name] = asyncio.ensure_future(method(self))
+
+            def _forget_failure(done: asyncio.Future):
+                if (done.cancelled() or done.exception() is not None) and memo.get(name) is done:
+                    del memo[name]
+
+            task.add_done_callback(_forget_failure)
+        return await task
+    return wrapper
+
+def reset_memo(obj):
+    """Drops every value memoized with memoize_async on obj."""
+    obj.__dict__.pop("_memo", None)
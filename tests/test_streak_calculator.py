@@ -0,0 +1,62 @@
+import unittest
+from datetime import date, timedelta
+
+from src.services.streak_calculator import StreakCalculator
+
+
+def calendar(counts, end=None):
+    """Builds contribution days for consecutive dates, the last one falling on end (default today)."""
+    end = end or date.today()
+    start = end - timedelta(days=len(counts) - 1)
+    return [{"date": (start + timedelta(days=i)).isoformat(), "count": count} for i, count in enumerate(counts)]
+
+
+class CurrentStreakTests(unittest.TestCase):
+    def setUp(self):
+        self.today = date.today()
+        self.calculator = StreakCalculator()
+
+    def test_streak_ending_today(self):
+        current = self.calculator.calculate_streaks(calendar([0, 2, 1, 3]))["current_streak"]
+        self.assertEqual(current["length"], 3)
+        self.assertEqual(current["start_date"], self.today - timedelta(days=2))
+        self.assertEqual(current["end_date"], self.today)
+
+    def test_today_without_contributions_breaks_the_streak(self):
+        current = self.calculator.calculate_streaks(calendar([1, 1, 0]))["current_streak"]
+        self.assertEqual(current["length"], 0)
+        self.assertEqual(current["end_date"], self.today)
+
+    def test_calendar_ending_yesterday_counts_only_yesterday(self):
+        yesterday = self.today - timedelta(days=1)
+        current = self.calculator.calculate_streaks(calendar([1, 1, 1], end=yesterday))["current_streak"]
+        self.assertEqual(current["length"], 1)
+        self.assertEqual(current["start_date"], yesterday)
+        self.assertEqual(current["end_date"], yesterday)
+
+    def test_gap_ends_the_streak(self):
+        current = self.calculator.calculate_streaks(calendar([1, 1, 0, 1, 1]))["current_streak"]
+        self.assertEqual(current["length"], 2)
+        self.assertEqual(current["start_date"], self.today - timedelta(days=1))
+
+    def test_missing_date_ends_the_streak(self):
+        days = calendar([1, 1, 1, 1])
+        del days[1]
+        current = self.calculator.calculate_streaks(days)["current_streak"]
+        self.assertEqual(current["length"], 2)
+
+
+class LongestStreakTests(unittest.TestCase):
+    def test_earliest_of_tied_longest_runs(self):
+        end = date(2024, 3, 10)
+        longest = StreakCalculator().calculate_streaks(calendar([1, 1, 1, 0, 1, 1, 1, 0], end=end))["longest_streak"]
+        self.assertEqual(longest["length"], 3)
+        self.assertEqual(longest["start_date"], date(2024, 3, 3))
+        self.assertEqual(longest["end_date"], date(2024, 3, 5))
+
+    def test_no_contributions(self):
+        self.assertIsNone(StreakCalculator().calculate_streaks(calendar([0, 0]))["longest_streak"])
+
+
+if __name__ == "__main__":
+    unittest.main()
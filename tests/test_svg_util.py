@@ -0,0 +1,37 @@
+import unittest
+
+from src.svg_util.svg_util import GitHubSVGUtil
+
+
+class BuildTemplateDataTests(unittest.TestCase):
+    def test_counts_are_formatted_from_the_stats_values(self):
+        data = GitHubSVGUtil.build_template_data({"total_stars": 10, "total_commits": 5, "total_contributions": 7})
+        self.assertEqual(data.total_stars, "10")
+        self.assertEqual(data.total_commits, "5")
+        self.assertEqual(data.total_contributions, "7")
+
+    def test_counts_use_thousands_separators(self):
+        data = GitHubSVGUtil.build_template_data({"total_stars": 1034, "total_commits": 1234567})
+        self.assertEqual(data.total_stars, "1,034")
+        self.assertEqual(data.total_commits, "1,234,567")
+
+    def test_missing_values_fall_back_to_defaults(self):
+        data = GitHubSVGUtil.build_template_data({})
+        self.assertEqual(data.total_stars, "0")
+        self.assertEqual(data.user_name, "UNKNOWN USER")
+        self.assertEqual(data.current_streak_dates, "N/A - N/A")
+        self.assertEqual(data["contribution_period"], "N/A - Present")
+
+    def test_languages_are_the_largest_by_percentage(self):
+        report = {f"Lang{i}": {"percentage": float(i)} for i in range(10)}
+        data = GitHubSVGUtil.build_template_data({"Languages": report})
+        self.assertEqual([lang.name for lang in data.languages], ["Lang9", "Lang8", "Lang7", "Lang6", "Lang5", "Lang4"])
+        self.assertAlmostEqual(data.total_language_percent, 39.0)
+
+    def test_languages_are_immutable(self):
+        data = GitHubSVGUtil.build_template_data({"Languages": {"Python": {"percentage": 100.0}}})
+        self.assertIsInstance(data.languages, tuple)
+
+
+if __name__ == "__main__":
+    unittest.main()